@@ -1,6 +1,6 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import os
 import pandas as pd
 
@@ -24,14 +24,25 @@ def ensure_loaded():
         load_all_sector_data()
         _df_loaded = True
 
+class ConstraintsReq(BaseModel):
+    min_weights: Dict[str, float] = Field({}, description="per-ticker minimum weight (0-1)")
+    max_weights: Dict[str, float] = Field({}, description="per-ticker maximum weight (0-1)")
+    sector_caps: Dict[str, float] = Field({}, description="per-sector maximum weight (0-1)")
+    whole_shares: bool = Field(False, description="allocate whole shares at the latest close")
+    lot_sizes: Dict[str, int] = Field({}, description="per-ticker minimum lot size in shares")
+
 class RecommendByTickersReq(BaseModel):
     amount: float = Field(..., gt=0)
     tickers: List[str]
+    seed: Optional[int] = Field(None, ge=0, description="simulation seed; a fresh one is drawn if omitted")
+    constraints: Optional[ConstraintsReq] = None
 
 class RecommendBySectorReq(BaseModel):
     amount: float = Field(..., gt=0)
     sectors: List[str] = []
     risk: str = Field("medium", description="one of low|medium|high")
+    seed: Optional[int] = Field(None, ge=0, description="simulation seed; a fresh one is drawn if omitted")
+    constraints: Optional[ConstraintsReq] = None
 
 @router.get("/sectors")
 def list_sectors():
@@ -49,7 +60,8 @@ def recommend_by_tickers(req: RecommendByTickersReq):
     if not req.tickers:
         raise HTTPException(400, "tickers required")
     try:
-        alloc, latest, history = get_recommendations_for_tickers(req.tickers, req.amount)
+        constraints = req.constraints.dict() if req.constraints else None
+        alloc, latest, history, leftover_cash, seed = get_recommendations_for_tickers(req.tickers, req.amount, req.seed, constraints)
     except Exception as e:
         raise HTTPException(400, str(e))
     # make JSON serializable
@@ -61,13 +73,16 @@ def recommend_by_tickers(req: RecommendByTickersReq):
         "allocation": alloc,
         "latest": latest,
         "history": {"dates": dates, "series": history_data},
+        "seed": seed,
+        "leftover_cash": leftover_cash,
     }
 
 @router.post("/recommend/sectors")
 def recommend_by_sectors(req: RecommendBySectorReq):
     ensure_loaded()
     try:
-        result = get_recommendations_by_sector(req.sectors, req.amount, req.risk)
+        constraints = req.constraints.dict() if req.constraints else None
+        result = get_recommendations_by_sector(req.sectors, req.amount, req.risk, req.seed, constraints)
     except Exception as e:
         raise HTTPException(400, str(e))
     # result is expected to contain allocation and chosen tickers
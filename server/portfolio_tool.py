@@ -1,6 +1,7 @@
 import pandas as pd
 import numpy as np
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 
@@ -148,46 +149,101 @@ def show_watchlist():
     print("Note: Install matplotlib for graphical display")
 
 # --- MPT Algorithm Implementation ---
-def run_mpt_simulation(past_data, num_portfolios=50000):
+
+# Portfolios simulated per independent random stream. The chunking depends only
+# on num_portfolios (never on the worker count), so a given seed always yields
+# the same streams and therefore bit-identical results.
+SIMULATION_CHUNK_SIZE = 5000
+
+def _default_workers():
+    """
+    Reads the worker pool size from MPT_WORKERS, falling back to the CPU count
+    when it is unset or malformed.
+    """
+    try:
+        workers = int(os.environ["MPT_WORKERS"])
+    except (KeyError, ValueError):
+        workers = os.cpu_count() or 1
+    return max(workers, 1)
+
+# Default size of the worker pool used by run_mpt_simulation
+DEFAULT_WORKERS = _default_workers()
+
+def new_seed():
+    """
+    Draws a fresh seed from OS entropy. It is kept below 2**53 so it survives
+    a round trip through JSON/JavaScript numbers unchanged.
+    """
+    return int(np.random.SeedSequence().generate_state(1, np.uint64)[0] >> 11)
+
+def _simulate_chunk(seed_seq, num_portfolios, mean_daily_returns, cov_matrix, annualizing_factor):
+    """
+    Simulates one chunk of random portfolios from its own random stream.
+    """
+    rng = np.random.default_rng(seed_seq)
+    num_assets = len(mean_daily_returns)
+
+    # Generate random weights for assets, one portfolio per row
+    weights = rng.random((num_portfolios, num_assets))
+    weights /= weights.sum(axis=1, keepdims=True)
+
+    # Calculate expected annual return, volatility, and Sharpe ratio
+    annual_returns = weights @ mean_daily_returns * annualizing_factor
+    variances = np.einsum('ij,jk,ik->i', weights, cov_matrix, weights)
+    annual_volatilities = np.sqrt(variances) * np.sqrt(annualizing_factor)
+    sharpe_ratios = annual_returns / annual_volatilities # Assuming a risk-free rate of 0
+
+    return annual_returns, annual_volatilities, sharpe_ratios, weights
+
+def run_mpt_simulation(past_data, num_portfolios=50000, seed=None, workers=None):
     """
     Performs a Monte Carlo simulation for Modern Portfolio Theory.
+
+    The simulation is split into chunks, each driven by an independent stream
+    spawned from SeedSequence(seed). Chunks run in parallel on a thread pool and
+    are merged in chunk order, so results for a given seed are identical
+    regardless of the number of workers. If no seed is given a fresh one is
+    drawn; either way it is returned under 'seed'.
     """
+    if num_portfolios < 1:
+        raise ValueError("num_portfolios must be at least 1")
+    if seed is None:
+        seed = new_seed()
+    if workers is None:
+        workers = DEFAULT_WORKERS
+
     # Calculate daily returns
     returns = past_data.pct_change().dropna()
-    mean_daily_returns = returns.mean()
-    cov_matrix = returns.cov()
-    
-    # Store results of the simulation
-    portfolio_returns = []
-    portfolio_volatilities = []
-    sharpe_ratios = []
-    portfolio_weights = []
-
-    # Get number of assets
-    num_assets = len(past_data.columns)
+    mean_daily_returns = returns.mean().to_numpy()
+    cov_matrix = returns.cov().to_numpy()
 
     # Calculate annualized factors
     annualizing_factor = 252 # Number of trading days in a year
 
-    for _ in range(num_portfolios):
-        # Generate random weights for assets
-        weights = np.random.random(num_assets)
-        weights /= np.sum(weights)
-        
-        # Calculate expected annual return, volatility, and Sharpe ratio
-        annual_return = np.sum(mean_daily_returns * weights) * annualizing_factor
-        annual_volatility = np.sqrt(np.dot(weights.T, np.dot(cov_matrix, weights))) * np.sqrt(annualizing_factor)
-        sharpe_ratio = annual_return / annual_volatility # Assuming a risk-free rate of 0
-        
-        portfolio_returns.append(annual_return)
-        portfolio_volatilities.append(annual_volatility)
-        sharpe_ratios.append(sharpe_ratio)
-        portfolio_weights.append(weights)
-
-    # Convert to numpy arrays
-    portfolio_returns = np.array(portfolio_returns)
-    portfolio_volatilities = np.array(portfolio_volatilities)
-    
+    # One independent random stream per chunk
+    chunk_sizes = [SIMULATION_CHUNK_SIZE] * (num_portfolios // SIMULATION_CHUNK_SIZE)
+    if num_portfolios % SIMULATION_CHUNK_SIZE:
+        chunk_sizes.append(num_portfolios % SIMULATION_CHUNK_SIZE)
+    child_seeds = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+
+    def simulate(args):
+        seed_seq, size = args
+        return _simulate_chunk(seed_seq, size, mean_daily_returns, cov_matrix, annualizing_factor)
+
+    jobs = list(zip(child_seeds, chunk_sizes))
+    if workers > 1 and len(jobs) > 1:
+        # NumPy releases the GIL for the heavy array work, so threads scale
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            chunks = list(pool.map(simulate, jobs))
+    else:
+        chunks = [simulate(job) for job in jobs]
+
+    # Merge the chunks back in order
+    portfolio_returns = np.concatenate([c[0] for c in chunks])
+    portfolio_volatilities = np.concatenate([c[1] for c in chunks])
+    sharpe_ratios = np.concatenate([c[2] for c in chunks])
+    portfolio_weights = np.concatenate([c[3] for c in chunks])
+
     # Find the optimal portfolio (highest Sharpe ratio)
     max_sharpe_idx = np.argmax(sharpe_ratios)
     optimal_portfolio_weights = portfolio_weights[max_sharpe_idx]
@@ -202,6 +258,7 @@ def run_mpt_simulation(past_data, num_portfolios=50000):
         'sharpe_ratios': sharpe_ratios,
         'weights': portfolio_weights,
         'tickers': past_data.columns,
+        'seed': seed,
         'optimal': {
             'weights': optimal_portfolio_weights,
             'return': portfolio_returns[max_sharpe_idx],
@@ -215,6 +272,342 @@ def run_mpt_simulation(past_data, num_portfolios=50000):
         }
     }
 
+# --- Constraint-aware optimization ---
+
+# Reverse lookup of SECTORS_DATA, used to apply per-sector caps
+TICKER_SECTORS = {ticker: sector for sector, tickers in SECTORS_DATA.items() for ticker in tickers}
+
+# Weights below this are folded back into the rest of the allocation
+MIN_ALLOCATION_WEIGHT = 0.01
+
+# Slack allowed when checking a portfolio against its constraints
+CONSTRAINT_TOLERANCE = 1e-9
+
+def _constraint_arrays(tickers, constraints):
+    """
+    Turns a constraints dict into bound arrays aligned with tickers.
+    Recognised keys: 'min_weights', 'max_weights' and 'sector_caps' (dicts).
+    Raises ValueError for a positive min weight on a ticker outside tickers
+    (e.g. dropped for missing data), an unknown sector or a cap outside
+    [0, 1]. Max weights for other tickers and caps for sectors with no
+    selected tickers cannot be broken and are ignored.
+    """
+    min_weights = constraints.get('min_weights') or {}
+    max_weights = constraints.get('max_weights') or {}
+    sector_caps = constraints.get('sector_caps') or {}
+
+    missing = sorted(t for t, w in min_weights.items() if float(w) > 0 and t not in tickers)
+    if missing:
+        raise ValueError(f"Minimum weights set for tickers not in the analysis: {', '.join(missing)}")
+    unknown = sorted(s for s in sector_caps if s not in SECTORS_DATA)
+    if unknown:
+        raise ValueError(f"Unknown sectors in sector caps: {', '.join(unknown)}")
+    if any(not 0 <= float(cap) <= 1 for cap in sector_caps.values()):
+        raise ValueError("Sector caps must be between 0 and 1")
+
+    lower = np.array([float(min_weights.get(t, 0.0)) for t in tickers])
+    upper = np.array([float(max_weights.get(t, 1.0)) for t in tickers])
+
+    # Group index per ticker for the capped sectors, -1 when uncapped
+    capped_sectors = sorted({TICKER_SECTORS.get(t) for t in tickers} & set(sector_caps))
+    groups = np.array([
+        capped_sectors.index(TICKER_SECTORS[t]) if TICKER_SECTORS.get(t) in capped_sectors else -1
+        for t in tickers
+    ])
+    caps = np.array([float(sector_caps[s]) for s in capped_sectors])
+
+    if np.any(lower < 0) or np.any(upper > 1) or np.any(lower > upper):
+        raise ValueError("Weight bounds must satisfy 0 <= min <= max <= 1")
+    if lower.sum() > 1:
+        raise ValueError("Minimum weights add up to more than 100%")
+    capped = groups >= 0
+    sector_min = np.bincount(groups[capped], weights=lower[capped], minlength=len(caps))
+    sector_max = np.minimum(np.bincount(groups[capped], weights=upper[capped], minlength=len(caps)), caps)
+    if np.any(sector_min > caps + 1e-12):
+        raise ValueError("Minimum weights exceed a sector cap")
+    if sector_max.sum() + upper[~capped].sum() < 1:
+        raise ValueError("Maximum weights and sector caps cannot reach 100%")
+
+    return lower, upper, groups, caps
+
+def _shift_to_target(v, lower, upper, target):
+    """
+    Finds t such that sum(clip(v - t, lower, upper)) == target.
+    The sum is piecewise linear in t, so t is found exactly by interpolating
+    between its breakpoints.
+    """
+    breaks = np.sort(np.concatenate([v - lower, v - upper]))
+    sums = np.clip(v[None, :] - breaks[:, None], lower, upper).sum(axis=1)
+    return np.interp(target, sums[::-1], breaks[::-1])
+
+def check_constraints(weights, lower, upper, groups, caps, tol=CONSTRAINT_TOLERANCE):
+    """
+    Raises ValueError if weights do not add up to 1 or break a bound or sector cap.
+    """
+    capped = groups >= 0
+    sector_sums = np.bincount(groups[capped], weights=weights[capped], minlength=len(caps))
+    if abs(weights.sum() - 1) > tol:
+        raise ValueError("Portfolio weights do not add up to 100%")
+    if np.any(weights < lower - tol) or np.any(weights > upper + tol):
+        raise ValueError("Portfolio weights break a per-ticker weight bound")
+    if np.any(sector_sums > caps + tol):
+        raise ValueError("Portfolio weights break a sector cap")
+
+def project_to_constraints(weights, lower, upper, groups, caps):
+    """
+    Exact Euclidean projection onto the feasible set: weights add up to 1,
+    stay within their bounds and every capped sector stays within its cap.
+
+    The solution is clip(v - t - t_s) for a shared shift t plus an extra shift
+    t_s for each sector held at its cap. For a given t a sector contributes
+    min(cap, sum(clip(v_s - t))), so the total is piecewise linear in t and t
+    is found exactly between the ticker breakpoints and the cap crossings.
+    """
+    v = np.asarray(weights, dtype=float)
+    if not len(caps):
+        w = np.clip(v - _shift_to_target(v, lower, upper, 1.0), lower, upper)
+        check_constraints(w, lower, upper, groups, caps)
+        return w
+
+    capped = groups >= 0
+    membership = (groups[:, None] == np.arange(len(caps))[None, :]).astype(float)
+
+    def totals(shifts):
+        clipped = np.clip(v[None, :] - shifts[:, None], lower, upper)
+        sector_sums = clipped @ membership
+        return np.minimum(sector_sums, caps).sum(axis=1) + clipped[:, ~capped].sum(axis=1), sector_sums
+
+    # Bracket t between two consecutive ticker breakpoints...
+    breaks = np.sort(np.concatenate([v - lower, v - upper]))
+    sums, _ = totals(breaks)
+    k = int(np.clip(np.searchsorted(-sums, -1.0), 1, len(breaks) - 1))
+    left, right = breaks[k - 1], breaks[k]
+
+    # ...where each sector sum is linear in t, so its cap crossing is exact
+    _, end_sums = totals(np.array([left, right]))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        crossings = left + (end_sums[0] - caps) / (end_sums[0] - end_sums[1]) * (right - left)
+    crossings = crossings[np.isfinite(crossings) & (crossings > left) & (crossings < right)]
+    points = np.sort(np.concatenate([[left, right], crossings]))
+    sums, _ = totals(points)
+    shift = np.interp(1.0, sums[::-1], points[::-1])
+
+    # Shift each sector that would overshoot its cap back down to the cap
+    w = np.clip(v - shift, lower, upper)
+    for g in np.flatnonzero(w @ membership > caps):
+        members = groups == g
+        u = v[members] - shift
+        u_shift = _shift_to_target(u, lower[members], upper[members], caps[g])
+        w[members] = np.clip(u - u_shift, lower[members], upper[members])
+
+    check_constraints(w, lower, upper, groups, caps)
+    return w
+
+def _annualized_moments(past_data):
+    """
+    Annualized mean returns and covariance matrix of the daily returns.
+    """
+    annualizing_factor = 252 # Number of trading days in a year
+    returns = past_data.pct_change().dropna()
+    return returns.mean().to_numpy() * annualizing_factor, returns.cov().to_numpy() * annualizing_factor
+
+def portfolio_performance(past_data, weights):
+    """
+    Expected annual return, volatility and Sharpe ratio of a set of weights.
+    """
+    mean_returns, cov_matrix = _annualized_moments(past_data)
+    weights = np.asarray(weights, dtype=float)
+    annual_return = mean_returns @ weights
+    annual_volatility = np.sqrt(weights @ cov_matrix @ weights)
+    return {
+        'return': annual_return,
+        'volatility': annual_volatility,
+        'sharpe': annual_return / annual_volatility if annual_volatility > 0 else 0.0
+    }
+
+def run_constrained_optimization(past_data, constraints, objective="sharpe", seed=None, workers=None, max_projections=1000):
+    """
+    Finds the best portfolio that satisfies per-ticker min/max weights and
+    per-sector caps (see _constraint_arrays for the constraints format).
+
+    The seeded Monte Carlo simulation supplies a starting point, which is
+    projected onto the feasible set and refined by projected gradient steps.
+    Every candidate is feasible by construction, so no samples are rejected.
+    The refinement stops after max_projections projections; an iteration
+    budget rather than a time limit keeps the result reproducible for a seed.
+    objective is 'sharpe' (maximise Sharpe ratio) or 'min_vol'.
+    """
+    tickers = past_data.columns.tolist()
+    lower, upper, groups, caps = _constraint_arrays(tickers, constraints)
+
+    mpt_results = run_mpt_simulation(past_data, seed=seed, workers=workers)
+    start = mpt_results['min_vol' if objective == 'min_vol' else 'optimal']['weights']
+
+    mean_returns, cov_matrix = _annualized_moments(past_data)
+
+    def score(w):
+        if objective == 'min_vol':
+            return -(w @ cov_matrix @ w)
+        return (mean_returns @ w) / np.sqrt(w @ cov_matrix @ w)
+
+    def gradient(w):
+        if objective == 'min_vol':
+            return -2 * cov_matrix @ w
+        variance = w @ cov_matrix @ w
+        volatility = np.sqrt(variance)
+        return mean_returns / volatility - (mean_returns @ w) * (cov_matrix @ w) / (variance * volatility)
+
+    weights = project_to_constraints(start, lower, upper, groups, caps)
+    best = score(weights)
+    step = 1.0
+    projections = 1
+    while projections < max_projections:
+        direction = gradient(weights)
+        # Backtrack until the projected step improves the objective
+        improved = False
+        while step > 1e-10 and projections < max_projections:
+            candidate = project_to_constraints(weights + step * direction, lower, upper, groups, caps)
+            projections += 1
+            candidate_score = score(candidate)
+            if candidate_score > best:
+                improved = True
+                break
+            step /= 2
+        if not improved:
+            break
+        moved = np.abs(candidate - weights).max()
+        weights, best = candidate, candidate_score
+        step *= 2
+        if moved < 1e-10:
+            break
+
+    result = portfolio_performance(past_data, weights)
+    result.update({
+        'weights': weights,
+        'tickers': past_data.columns,
+        'seed': mpt_results['seed']
+    })
+    return result
+
+def allocate_whole_shares(tickers, weights, prices, amount, constraints=None):
+    """
+    Converts target weights into whole-share (or whole-lot) holdings.
+
+    Each ticker first gets as many lots as fit within its target amount, and
+    at least enough lots (rounded up) to meet its min weight. The leftover
+    cash is then spent one lot at a time on the most under-allocated tickers,
+    but only where the extra lot brings the holding closer to its target and
+    breaks no max weight or sector cap; cash that cannot be placed that way
+    is reported as leftover.
+    constraints may carry 'lot_sizes' (shares per lot, default 1) along with
+    the keys read by _constraint_arrays. Raises ValueError if the min weights
+    cannot be met in whole lots within the amount and the caps.
+    Returns (allocation, leftover_cash).
+    """
+    constraints = constraints or {}
+    lot_sizes = constraints.get('lot_sizes') or {}
+    lower, upper, groups, caps = _constraint_arrays(tickers, constraints)
+
+    lots = np.array([int(lot_sizes.get(t, 1)) for t in tickers])
+    if np.any(lots < 1):
+        raise ValueError("Lot sizes must be at least 1 share")
+    lot_cost = np.array([prices[t] for t in tickers]) * lots
+    targets = amount * np.asarray(weights)
+
+    capped = groups >= 0
+    min_lots = np.ceil(lower * amount / lot_cost - 1e-9)
+    too_coarse = np.flatnonzero(min_lots * lot_cost > upper * amount + 1e-9)
+    if len(too_coarse):
+        raise ValueError(f"Minimum weight for {tickers[too_coarse[0]]} cannot be met in whole lots without exceeding its max weight")
+    min_sector_values = np.bincount(groups[capped], weights=(min_lots * lot_cost)[capped], minlength=len(caps))
+    if np.any(min_sector_values > caps * amount + 1e-9):
+        raise ValueError("Minimum weights cannot be met in whole lots without exceeding a sector cap")
+
+    held_lots = np.maximum(np.floor(targets / lot_cost), min_lots)
+
+    # Rounding the minimums up can overspend or push a sector past its cap,
+    # so sell lots above the minimum, starting with the most over-allocated
+    while True:
+        values = held_lots * lot_cost
+        sector_values = np.bincount(groups[capped], weights=values[capped], minlength=len(caps))
+        over_cap = sector_values > caps * amount + 1e-9
+        sellable = held_lots > min_lots
+        if over_cap.any():
+            sellable &= capped & over_cap[np.maximum(groups, 0)]
+        elif values.sum() <= amount + 1e-9:
+            break
+        if not sellable.any():
+            raise ValueError("Investment amount is too small to meet the minimum weights in whole lots")
+        i = np.argmax(np.where(sellable, values - targets, -np.inf))
+        held_lots[i] -= 1
+    leftover = amount - (held_lots * lot_cost).sum()
+
+    while True:
+        values = held_lots * lot_cost
+        sector_values = np.bincount(groups[capped], weights=values[capped], minlength=len(caps))
+        shortfall = targets - values
+        allowed = (
+            (lot_cost <= 2 * shortfall)
+            & (lot_cost <= leftover + 1e-9)
+            & (values + lot_cost <= upper * amount + 1e-9)
+        )
+        allowed[capped] &= sector_values[groups[capped]] + lot_cost[capped] <= caps[groups[capped]] * amount + 1e-9
+        if not allowed.any():
+            break
+        i = np.argmax(np.where(allowed, shortfall, -np.inf))
+        held_lots[i] += 1
+        leftover -= lot_cost[i]
+
+    allocation = {}
+    for i, ticker in enumerate(tickers):
+        if held_lots[i] > 0:
+            invested = float(held_lots[i] * lot_cost[i])
+            allocation[ticker] = {
+                "weight": invested / amount,
+                "target_weight": float(weights[i]),
+                "amount": invested,
+                "shares": int(held_lots[i] * lots[i]),
+                "price": float(prices[ticker])
+            }
+    return allocation, float(leftover)
+
+def build_allocation(tickers, weights, amount, threshold=MIN_ALLOCATION_WEIGHT):
+    """
+    Builds the allocation dict from weights. Weights below threshold are
+    dropped and the rest renormalised, so the amounts still add up to amount.
+    """
+    weights = np.asarray(weights, dtype=float)
+    kept = np.where(weights > threshold, weights, 0.0)
+    if kept.sum() > 0:
+        weights = kept / kept.sum()
+    allocation = {}
+    for i, ticker in enumerate(tickers):
+        if weights[i] > 0:
+            allocation[ticker] = {
+                "weight": float(weights[i]),
+                "amount": float(amount * weights[i])
+            }
+    return allocation
+
+def allocate_investment(tickers, weights, amount, prices, constraints=None):
+    """
+    Turns weights into the allocation handed to the user: whole shares at
+    prices when constraints ask for 'whole_shares', exact weights in
+    constrained mode, and significant weights only otherwise.
+    Returns (allocation, leftover_cash).
+    """
+    if constraints is not None and constraints.get('whole_shares'):
+        return allocate_whole_shares(tickers, weights, prices, amount, constraints)
+    threshold = 0 if constraints is not None else MIN_ALLOCATION_WEIGHT
+    return build_allocation(tickers, weights, amount, threshold=threshold), 0.0
+
+def allocated_weights(tickers, allocation):
+    """
+    Weights actually held per ticker (0 when not allocated), as a fraction of
+    the investment; any leftover cash is the remainder.
+    """
+    return np.array([allocation[t]['weight'] if t in allocation else 0.0 for t in tickers])
+
 def display_recommendations(investment_amount, risk_tolerance, mpt_results):
     """
     Helper function to display the MPT recommendations based on the results.
@@ -241,11 +634,11 @@ def display_recommendations(investment_amount, risk_tolerance, mpt_results):
     
     print("\n  Recommended Allocation:")
     total_allocated_amount = 0
-    for i, weight in enumerate(chosen_portfolio['weights']):
-        if weight > 0.01: # Only show assets with significant allocation (> 1%)
-            rupee_allocation = investment_amount * weight
-            total_allocated_amount += rupee_allocation
-            print(f"    - {tickers[i]}: {weight:.2%} (₹{rupee_allocation:.2f})")
+    # Only show assets with significant allocation (> 1%), redistributing the rest
+    allocation = build_allocation(list(tickers), chosen_portfolio['weights'], investment_amount)
+    for ticker, entry in allocation.items():
+        total_allocated_amount += entry['amount']
+        print(f"    - {ticker}: {entry['weight']:.2%} (₹{entry['amount']:.2f})")
     
     print(f"\nTotal Allocated Amount: ₹{total_allocated_amount:.2f}")
 
@@ -388,10 +781,19 @@ def get_dataset_summary():
         "sectors": list(SECTORS_DATA.keys())
     }
 
-def get_recommendations_for_tickers(tickers, amount):
+def get_latest_prices(tickers):
+    """Latest closing price for each ticker, unrounded."""
+    return {ticker: float(df_stocks[ticker].iloc[-1]) for ticker in tickers}
+
+def get_recommendations_for_tickers(tickers, amount, seed=None, constraints=None):
     """
     Get MPT recommendations for specific tickers.
-    Returns allocation, latest prices, and historical data.
+    Returns allocation, latest prices, historical data, leftover cash and the
+    seed used, so the result can be reproduced.
+    Pass a seed to make the simulation reproducible, and a constraints dict
+    ('min_weights', 'max_weights', 'sector_caps', 'whole_shares', 'lot_sizes')
+    to respect weight bounds and sector caps and, with 'whole_shares', to buy
+    whole shares (or lots) at the latest close.
     """
     if df_stocks is None:
         raise ValueError("Data not loaded")
@@ -404,30 +806,27 @@ def get_recommendations_for_tickers(tickers, amount):
     # Get stock data
     stock_data, past_data = get_stock_data(available_tickers)
     
-    # Run MPT simulation
-    mpt_results = run_mpt_simulation(past_data)
-    
     # Use optimal portfolio (can be modified based on risk preference)
-    optimal_weights = mpt_results['optimal']['weights']
-    
-    # Create allocation dictionary
-    allocation = {}
-    for i, ticker in enumerate(available_tickers):
-        weight = optimal_weights[i]
-        if weight > 0.01:  # Only include significant allocations
-            allocation[ticker] = {
-                "weight": float(weight),
-                "amount": float(amount * weight)
-            }
+    if constraints is not None:
+        result = run_constrained_optimization(past_data, constraints, "sharpe", seed=seed)
+        optimal_weights, seed = result['weights'], result['seed']
+    else:
+        mpt_results = run_mpt_simulation(past_data, seed=seed)
+        optimal_weights, seed = mpt_results['optimal']['weights'], mpt_results['seed']
     
     # Get latest prices
-    latest_prices = {ticker: float(df_stocks[ticker].iloc[-1]) for ticker in available_tickers}
+    latest_prices = get_latest_prices(available_tickers)
     
-    return allocation, latest_prices, past_data
+    # Create allocation dictionary
+    allocation, leftover_cash = allocate_investment(available_tickers, optimal_weights, amount, latest_prices, constraints)
+    
+    return allocation, latest_prices, past_data, leftover_cash, seed
 
-def get_recommendations_by_sector(sectors, amount, risk_tolerance="medium"):
+def get_recommendations_by_sector(sectors, amount, risk_tolerance="medium", seed=None, constraints=None):
     """
     Get MPT recommendations for stocks from specific sectors.
+    The seed used for the simulation is returned so the result can be reproduced.
+    See get_recommendations_for_tickers for the constraints dict.
     """
     if df_stocks is None:
         raise ValueError("Data not loaded")
@@ -456,34 +855,36 @@ def get_recommendations_by_sector(sectors, amount, risk_tolerance="medium"):
     if past_data.empty:
         raise ValueError("No historical data available for selected tickers")
     
-    # Run MPT simulation
-    mpt_results = run_mpt_simulation(past_data)
-    
     # Choose portfolio based on risk tolerance
-    if risk_tolerance == 'low':
-        chosen_portfolio = mpt_results['min_vol']
+    if constraints is not None:
+        objective = 'min_vol' if risk_tolerance == 'low' else 'sharpe'
+        chosen_portfolio = run_constrained_optimization(past_data, constraints, objective, seed=seed)
+        seed = chosen_portfolio['seed']
     else:
-        chosen_portfolio = mpt_results['optimal']
+        mpt_results = run_mpt_simulation(past_data, seed=seed)
+        if risk_tolerance == 'low':
+            chosen_portfolio = mpt_results['min_vol']
+        else:
+            chosen_portfolio = mpt_results['optimal']
+        seed = mpt_results['seed']
     
     # Create allocation
-    allocation = {}
     tickers = past_data.columns.tolist()
-    for i, weight in enumerate(chosen_portfolio['weights']):
-        if weight > 0.01:  # Only include significant allocations
-            ticker = tickers[i]
-            allocation[ticker] = {
-                "weight": float(weight),
-                "amount": float(amount * weight)
-            }
+    allocation, leftover_cash = allocate_investment(tickers, chosen_portfolio['weights'], amount, get_latest_prices(tickers), constraints)
+    
+    # Report stats for the holdings actually allocated, not the raw weights
+    stats = portfolio_performance(past_data, allocated_weights(tickers, allocation))
     
     return {
         "allocation": allocation,
         "portfolio_stats": {
-            "expected_return": float(chosen_portfolio['return']),
-            "volatility": float(chosen_portfolio['volatility']),
-            "sharpe_ratio": float(chosen_portfolio.get('sharpe', 0))
+            "expected_return": float(stats['return']),
+            "volatility": float(stats['volatility']),
+            "sharpe_ratio": float(stats['sharpe'])
         },
-        "selected_tickers": tickers
+        "selected_tickers": tickers,
+        "seed": seed,
+        "leftover_cash": leftover_cash
     }
 
 if __name__ == "__main__":
@@ -0,0 +1,63 @@
+"""
+Reproducibility checks for the seeded, chunked MPT simulation in portfolio_tool.
+
+Run directly (python test_mpt_simulation.py) or with pytest.
+"""
+import contextlib
+import io
+
+import numpy as np
+
+import portfolio_tool as pt
+
+def _load_data():
+    if pt.df_stocks is None:
+        with contextlib.redirect_stdout(io.StringIO()):
+            pt.load_all_sector_data()
+    return pt.df_stocks.dropna(axis=1)
+
+def test_results_are_identical_for_any_worker_count():
+    df = _load_data()
+    for seed in (0, 42):
+        reference = pt.run_mpt_simulation(df, num_portfolios=20000, seed=seed, workers=1)
+        for workers in (2, 4, 8):
+            result = pt.run_mpt_simulation(df, num_portfolios=20000, seed=seed, workers=workers)
+            assert np.array_equal(result['weights'], reference['weights'])
+            assert np.array_equal(result['sharpe_ratios'], reference['sharpe_ratios'])
+            assert np.array_equal(result['optimal']['weights'], reference['optimal']['weights'])
+            assert result['seed'] == seed
+
+def test_partial_chunk_has_the_requested_shape():
+    df = _load_data()
+    for num_portfolios in (7, pt.SIMULATION_CHUNK_SIZE + 7):
+        result = pt.run_mpt_simulation(df, num_portfolios=num_portfolios, seed=1, workers=4)
+        assert result['weights'].shape == (num_portfolios, len(df.columns))
+        assert result['sharpe_ratios'].shape == (num_portfolios,)
+        assert np.allclose(result['weights'].sum(axis=1), 1)
+
+def test_different_seeds_give_different_results():
+    df = _load_data()
+    first = pt.run_mpt_simulation(df, num_portfolios=1000, seed=1)
+    second = pt.run_mpt_simulation(df, num_portfolios=1000, seed=2)
+    assert not np.array_equal(first['weights'], second['weights'])
+
+def test_missing_seed_is_drawn_and_returned():
+    df = _load_data()
+    result = pt.run_mpt_simulation(df, num_portfolios=100)
+    again = pt.run_mpt_simulation(df, num_portfolios=100, seed=result['seed'])
+    assert np.array_equal(result['weights'], again['weights'])
+
+def test_simulation_rejects_empty_runs():
+    df = _load_data()
+    try:
+        pt.run_mpt_simulation(df, num_portfolios=0)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError for num_portfolios=0")
+
+if __name__ == "__main__":
+    for name, func in list(globals().items()):
+        if name.startswith("test_") and callable(func):
+            func()
+            print(f"✅ {name}")
@@ -0,0 +1,171 @@
+"""
+Property checks for the constraint-aware optimizer in portfolio_tool and for
+the allocations returned by the recommendation functions.
+
+Run directly (python test_portfolio_constraints.py) or with pytest.
+"""
+import contextlib
+import io
+
+import numpy as np
+
+import portfolio_tool as pt
+
+TICKERS = [t for tickers in pt.SECTORS_DATA.values() for t in tickers]
+
+CONSTRAINT_SETS = [
+    {},
+    {"sector_caps": {"Defence": 0.0}},
+    {"sector_caps": {"Defence": 0.1, "Finance": 0.15, "Technology": 0.1}},
+    {"sector_caps": {s: 0.126 for s in pt.SECTORS_DATA}},
+    {
+        "min_weights": {"TCS": 0.05, "ITC": 0.04},
+        "max_weights": {t: 0.08 for t in TICKERS},
+        "sector_caps": {"Finance": 0.15, "Defence": 0.1, "Technology": 0.2},
+    },
+]
+
+TOL = 1e-8
+
+def _load_data():
+    if pt.df_stocks is None:
+        with contextlib.redirect_stdout(io.StringIO()):
+            pt.load_all_sector_data()
+    return pt.df_stocks.dropna(axis=1)
+
+def assert_feasible(weights, tickers, constraints):
+    """Checks sum-to-one, per-ticker bounds and sector caps independently of the tool."""
+    assert abs(weights.sum() - 1) < TOL, weights.sum()
+    for ticker, w in zip(tickers, weights):
+        assert w >= constraints.get("min_weights", {}).get(ticker, 0.0) - TOL, (ticker, w)
+        assert w <= constraints.get("max_weights", {}).get(ticker, 1.0) + TOL, (ticker, w)
+    for sector, cap in constraints.get("sector_caps", {}).items():
+        total = sum(w for t, w in zip(tickers, weights) if pt.TICKER_SECTORS[t] == sector)
+        assert total <= cap + TOL, (sector, total, cap)
+
+def test_projection_is_feasible_for_random_and_large_inputs():
+    rng = np.random.default_rng(0)
+    for constraints in CONSTRAINT_SETS:
+        bounds = pt._constraint_arrays(TICKERS, constraints)
+        for scale in (1e-3, 1.0, 10.0, 1e6):
+            for _ in range(200):
+                v = rng.normal(size=len(TICKERS)) * scale
+                assert_feasible(pt.project_to_constraints(v, *bounds), TICKERS, constraints)
+
+def test_projection_is_idempotent_and_closest():
+    rng = np.random.default_rng(1)
+    for constraints in CONSTRAINT_SETS:
+        bounds = pt._constraint_arrays(TICKERS, constraints)
+        v = rng.normal(size=len(TICKERS)) * 10
+        w = pt.project_to_constraints(v, *bounds)
+        assert np.allclose(pt.project_to_constraints(w, *bounds), w, atol=1e-12)
+        # No other feasible point may be closer to v
+        for _ in range(200):
+            other = pt.project_to_constraints(w + rng.normal(size=len(TICKERS)) * 0.05, *bounds)
+            assert np.linalg.norm(v - other) >= np.linalg.norm(v - w) - 1e-9
+
+def test_infeasible_constraints_raise():
+    for constraints in (
+        {"sector_caps": {s: 0.1 for s in pt.SECTORS_DATA}},
+        {"min_weights": {"TCS": 0.6, "ITC": 0.6}},
+        {"min_weights": {"TCS": 0.2}, "sector_caps": {"Technology": 0.1}},
+    ):
+        try:
+            pt._constraint_arrays(TICKERS, constraints)
+        except ValueError:
+            continue
+        raise AssertionError(f"expected ValueError for {constraints}")
+
+def test_constrained_optimization_is_feasible_and_reproducible():
+    df = _load_data()
+    tickers = df.columns.tolist()
+    for constraints in CONSTRAINT_SETS:
+        for objective in ("sharpe", "min_vol"):
+            result = pt.run_constrained_optimization(df, constraints, objective, seed=7, workers=1)
+            assert_feasible(result['weights'], tickers, constraints)
+            again = pt.run_constrained_optimization(df, constraints, objective, seed=7, workers=4)
+            assert np.array_equal(result['weights'], again['weights'])
+
+def test_whole_shares_meet_min_weights():
+    df = _load_data()
+    tickers = df.columns.tolist()
+    constraints = {"min_weights": {"MARUTI": 0.05}, "lot_sizes": {"MARUTI": 10}, "whole_shares": True}
+    weights = pt.run_constrained_optimization(df, constraints, seed=3)['weights']
+    prices = {t: pt.get_stock_data([t])[0][t]['Close'] for t in tickers}
+    for amount in (1e6, 1e7):
+        allocation, leftover = pt.allocate_whole_shares(tickers, weights, prices, amount, constraints)
+        assert allocation["MARUTI"]["weight"] >= 0.05 - TOL
+        assert allocation["MARUTI"]["shares"] % 10 == 0
+        assert leftover >= -TOL
+        assert abs(sum(a["amount"] for a in allocation.values()) + leftover - amount) < 1e-6
+    try:
+        pt.allocate_whole_shares(tickers, weights, prices, 1e4, constraints)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError when a lot of MARUTI is unaffordable")
+
+def test_unusable_constraints_raise():
+    _load_data()
+    for constraints in (
+        {"min_weights": {"DATAPATTNS": 0.5}},  # dropped by dropna for its short history
+        {"sector_caps": {"Tech": 0.1}},
+        {"sector_caps": {"Defence": -0.1}},
+        {"sector_caps": {"Defence": 1.5}},
+    ):
+        try:
+            pt.get_recommendations_by_sector(["Defence"], 1e5, "medium", 1, constraints)
+        except ValueError:
+            continue
+        raise AssertionError(f"expected ValueError for {constraints}")
+
+def test_allocations_add_up_without_constraints():
+    _load_data()
+    amount = 123456.0
+    allocation, _, _, leftover, _ = pt.get_recommendations_for_tickers(["TCS", "INFY", "ITC", "SBIN"], amount, seed=2)
+    assert leftover == 0.0
+    assert abs(sum(a["amount"] for a in allocation.values()) - amount) < 1e-6
+    for risk in ("low", "medium"):
+        result = pt.get_recommendations_by_sector([], amount, risk, seed=2)
+        # With 38 tickers several random weights fall below 1% and get folded back
+        assert len(result["allocation"]) < len(result["selected_tickers"])
+        assert result["leftover_cash"] == 0.0
+        assert abs(sum(a["amount"] for a in result["allocation"].values()) - amount) < 1e-6
+
+def test_sector_stats_describe_allocated_weights():
+    df = _load_data()
+    tickers = df.columns.tolist()
+    for constraints in (None, {"sector_caps": {"Defence": 0.1}, "whole_shares": True}):
+        result = pt.get_recommendations_by_sector([], 1e5, "medium", 4, constraints)
+        held = pt.allocated_weights(tickers, result["allocation"])
+        expected = pt.portfolio_performance(df, held)
+        stats = result["portfolio_stats"]
+        assert np.isclose(stats["expected_return"], expected["return"])
+        assert np.isclose(stats["volatility"], expected["volatility"])
+        assert np.isclose(stats["sharpe_ratio"], expected["sharpe"])
+
+def test_whole_share_prices_match_latest():
+    _load_data()
+    allocation, latest, _, leftover, _ = pt.get_recommendations_for_tickers(
+        ["MARUTI", "TCS", "ITC"], 1e5, seed=5, constraints={"whole_shares": True})
+    for ticker, entry in allocation.items():
+        assert entry["price"] == latest[ticker]
+    assert abs(sum(a["amount"] for a in allocation.values()) + leftover - 1e5) < 1e-6
+
+def test_extra_lots_never_overshoot_by_more_than_half_a_lot():
+    df = _load_data()
+    tickers = df.columns.tolist()
+    prices = pt.get_latest_prices(tickers)
+    rng = np.random.default_rng(5)
+    for amount in (1e3, 1e4, 1e5):
+        weights = rng.dirichlet(np.ones(len(tickers)))
+        allocation, _ = pt.allocate_whole_shares(tickers, weights, prices, amount)
+        for ticker, w in zip(tickers, weights):
+            held = allocation.get(ticker, {"amount": 0.0})["amount"]
+            assert held - amount * w <= prices[ticker] / 2 + 1e-9, (ticker, held, amount * w)
+
+if __name__ == "__main__":
+    for name, func in list(globals().items()):
+        if name.startswith("test_") and callable(func):
+            func()
+            print(f"✅ {name}")